@@ -0,0 +1,169 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Cython version of the decompression core from decomptest.py
+
+decomptest.py uses it when Numba is not installed but this module has been
+built. Build it in place (needs Cython and a C compiler) with:
+
+    cythonize -i decomp_core.pyx
+"""
+from libc.string cimport memcpy, memset
+
+# Same values as the STATUS_* codes in decomptest.py
+cdef enum:
+    STATUS_BAD_OFFSET = 1
+    STATUS_LONG_COPY = 2
+    STATUS_OVERRUN = 3
+    STATUS_SPECIAL_END = 4
+    STATUS_EOF_LITERAL = 5
+    STATUS_EOF_MATCH = 6
+    STATUS_EOF_EXTLEN = 7
+    STATUS_EMPTY_OUTPUT = 8
+
+cdef inline void record_diagnostic(Py_ssize_t[:, ::1] diagnostics, int status, Py_ssize_t pos,
+                                   Py_ssize_t out_len, Py_ssize_t value):
+    """
+    Count a diagnostic in the table, keeping the details of the first one
+    """
+    if diagnostics[status, 0] == 0:
+        diagnostics[status, 1] = pos
+        diagnostics[status, 2] = out_len
+        diagnostics[status, 3] = value
+    diagnostics[status, 0] += 1
+
+def decompress_core(buf_obj, out_obj, Py_ssize_t start, bint special_mode,
+                    Py_ssize_t ec_value, bint special_flag, Py_ssize_t data_size):
+    """
+    Main decompression loop, same arguments and results as _decompress_core
+
+    Args:
+        buf_obj: Bytes-like object containing compressed data
+        out_obj: Preallocated bytearray of data_size bytes
+        start: Position of the first command byte in buf_obj
+        special_mode: Whether to use special mode decompression (jump target 5)
+        ec_value: Control byte value with the special flag bit cleared
+        special_flag: Whether the control byte had its high bit set
+        data_size: Expected size of the decompressed data
+
+    Returns:
+        A tuple of (out_obj, out_len, diagnostics)
+    """
+    cdef const unsigned char[::1] buf = buf_obj
+    cdef unsigned char[::1] out = out_obj
+    cdef const unsigned char *b = &buf[0]
+    cdef unsigned char *o = NULL
+    cdef Py_ssize_t data_len = buf.shape[0]
+    cdef Py_ssize_t pos = start
+    cdef Py_ssize_t out_len = 0
+    cdef Py_ssize_t special_counter = 0x100
+    cdef Py_ssize_t offset, copy_length, src, remaining, off
+    cdef unsigned int match_info, length_field
+    cdef unsigned int command_bits = 1    # Unread command bits with an end marker
+    cdef unsigned int command_bit
+    # One [count, position, output size, value] row per status code, row 0 unused
+    cdef Py_ssize_t diagnostic_table[9][4]
+    cdef Py_ssize_t[:, ::1] diagnostics = diagnostic_table
+
+    diagnostics[:, :] = 0
+
+    if data_size > 0:
+        o = &out[0]
+
+    while out_len < data_size and pos < data_len:
+        # Check special mode counter
+        if special_mode and special_counter <= 0:
+            record_diagnostic(diagnostics, STATUS_SPECIAL_END, pos, out_len, 0)
+            break
+
+        # Get next command bit
+        if command_bits == 1:
+            command_bits = b[pos] | 0x100
+            pos += 1
+
+        command_bit = command_bits & 1
+        command_bits >>= 1
+
+        if command_bit:
+            # Copy literal byte
+            if pos >= data_len:
+                record_diagnostic(diagnostics, STATUS_EOF_LITERAL, pos, out_len, 0)
+                break
+
+            o[out_len] = b[pos]
+            out_len += 1
+            pos += 1
+
+            # Decrement special counter if in special mode
+            if special_mode:
+                special_counter -= 1
+        else:
+            # Read match info (16-bit)
+            if pos + 1 >= data_len:
+                record_diagnostic(diagnostics, STATUS_EOF_MATCH, pos, out_len, 0)
+                break
+
+            match_info = b[pos] | (b[pos+1] << 8)
+            pos += 2
+
+            # Extract offset and length
+            offset = (match_info & 0x0FFF) + 1
+            length_field = (match_info >> 12) & 0x0F
+
+            # Calculate total length
+            copy_length = length_field + ec_value
+
+            # Handle extended length
+            if length_field == 0x0F and special_flag:
+                if pos >= data_len:
+                    record_diagnostic(diagnostics, STATUS_EOF_EXTLEN, pos, out_len, 0)
+                    break
+
+                copy_length += b[pos]
+                pos += 1
+
+            # Error checks
+            if offset > out_len:
+                # Try to recover by skipping this command
+                record_diagnostic(diagnostics, STATUS_BAD_OFFSET, pos - 2, out_len, offset)
+                continue
+
+            if copy_length > 0x2000:  # Reasonable upper limit for copy length
+                record_diagnostic(diagnostics, STATUS_LONG_COPY, pos, out_len, copy_length)
+                copy_length = 0x2000
+
+            # Check if copy would exceed data_size
+            if out_len + copy_length > data_size:
+                record_diagnostic(diagnostics, STATUS_OVERRUN, pos, out_len, copy_length)
+                copy_length = data_size - out_len
+
+            # Ensure we have valid output bytes to copy from
+            if out_len == 0:
+                record_diagnostic(diagnostics, STATUS_EMPTY_OUTPUT, pos, out_len, 0)
+                break
+
+            # Copy bytes from earlier in the output
+            src = out_len - offset
+            if offset == 1:
+                memset(o + out_len, o[src], copy_length)
+                out_len += copy_length
+            elif offset >= copy_length:
+                memcpy(o + out_len, o + src, copy_length)
+                out_len += copy_length
+            else:
+                # Overlapping copy, double the chunk size each time so no
+                # single memcpy overlaps what it copies from
+                remaining = copy_length
+                off = offset
+                while off <= remaining:
+                    memcpy(o + out_len, o + src, off)
+                    out_len += off
+                    remaining -= off
+                    off <<= 1
+                memcpy(o + out_len, o + src, remaining)
+                out_len += remaining
+
+            # Decrement special counter if in special mode
+            if special_mode:
+                special_counter -= 1
+
+    return out_obj, out_len, diagnostic_table
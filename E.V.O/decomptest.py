@@ -1,82 +1,147 @@
+import argparse
+import mmap
 import os
+import struct
 import sys
-
-def decompress_evo_data(compressed_data, start_offset=0, special_mode=False):
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Numba is optional: when it is installed the compiled decompression core is
+# used. Otherwise the Cython core is used if decomp_core.pyx has been built,
+# and the plain Python one if not.
+try:
+    import numpy as np
+    from numba import njit, types
+except ImportError:
+    np = None
+    njit = None
+
+try:
+    from decomp_core import decompress_core as _decompress_core_c
+except ImportError:
+    _decompress_core_c = None
+
+# Status codes for the diagnostics recorded by the decompression cores. The
+# cores never print, they fill a table with one [count, position, output size,
+# value] row per status code, keeping the details of the first occurrence,
+# and decompress_evo_data reports it once decompression is done.
+STATUS_BAD_OFFSET = 1          # Match offset pointed before the start of the output (skipped)
+STATUS_LONG_COPY = 2           # Copy length was above 0x2000 (limited)
+STATUS_OVERRUN = 3             # Copy would have gone past data_size (limited)
+STATUS_SPECIAL_END = 4         # Special mode counter reached 0
+STATUS_EOF_LITERAL = 5         # Ran out of input reading a literal byte
+STATUS_EOF_MATCH = 6           # Ran out of input reading match info
+STATUS_EOF_EXTLEN = 7          # Ran out of input reading an extended length
+STATUS_EMPTY_OUTPUT = 8        # Match with nothing in the output to copy from
+
+# Rows in the diagnostics table, indexed by status code (row 0 is unused)
+_DIAGNOSTIC_ROWS = STATUS_EMPTY_OUTPUT + 1
+
+_STATUS_MESSAGES = {
+    STATUS_BAD_OFFSET: "Error: Invalid offset {value} at position {pos} (output size: {out_len})",
+    STATUS_LONG_COPY: "Warning: Suspiciously large copy_length: {value}, limiting to 0x2000",
+    STATUS_OVERRUN: "Warning: Copy would exceed expected data size. Limiting copy.",
+    STATUS_SPECIAL_END: "Special mode counter reached 0, terminating early at {out_len} bytes",
+    STATUS_EOF_LITERAL: "Error: Reached end of input data at position {pos}",
+    STATUS_EOF_MATCH: "Error: Not enough data for match info at position {pos}",
+    STATUS_EOF_EXTLEN: "Error: Not enough data for extended length at position {pos}",
+    STATUS_EMPTY_OUTPUT: "Error: Cannot copy from empty output buffer",
+}
+
+# Reads a 16-bit little endian value, used for match info and data sizes
+_U16LE = struct.Struct("<H").unpack_from
+
+# Literal run length for every value of command_bits: the number of trailing
+# 1 bits (literal commands) below its end marker bit. Consumed bits are shifted
+# out, so this is the literal run starting at the current bit.
+_LITERAL_RUN = bytes(min((v ^ (v + 1)).bit_length(), v.bit_length() or 1) - 1 for v in range(512))
+
+def _record_diagnostic(diagnostics, status, pos, out_len, value):
     """
-    Decompress E.V.O.: Search for Eden compressed data
+    Count a diagnostic in the table, keeping the details of the first one
+    """
+    row = diagnostics[status]
+    if row[0] == 0:
+        row[1] = pos
+        row[2] = out_len
+        row[3] = value
+    row[0] += 1
+
+def _decompress_core(buf, out, start, special_mode, ec_value, special_flag, data_size):
+    """
+    Main decompression loop, tuned for plain Python
 
     Args:
-        compressed_data: Bytes object containing compressed data
-        start_offset: Starting offset in the compressed data
+        buf: Bytes-like object containing compressed data
+        out: Preallocated bytearray of data_size bytes
+        start: Position of the first command byte in buf
         special_mode: Whether to use special mode decompression (jump target 5)
+        ec_value: Control byte value with the special flag bit cleared
+        special_flag: Whether the control byte had its high bit set
+        data_size: Expected size of the decompressed data
 
     Returns:
-        Bytes object containing decompressed data
+        A tuple of (out, out_len, diagnostics)
     """
-    output = bytearray()
-    pos = start_offset
-
-    # Read first control byte
-    ec_value = compressed_data[pos]
-    pos += 1
-
-    # Check for special flag in control byte
-    special_flag = False
-    if ec_value & 0x80:
-        ec_value &= 0x7F
-        special_flag = True
+    pos = start
+    out_len = 0
+    data_len = len(buf)
+    diagnostics = [[0, 0, 0, 0] for _ in range(_DIAGNOSTIC_ROWS)]
 
-    # Read data size (16-bit)
-    data_size = compressed_data[pos] + (compressed_data[pos+1] << 8)
-    pos += 2
-
-    print(f"Control byte: {ec_value:02X}")
-    print(f"Special flag: {special_flag}")
-    print(f"Data size: {data_size} bytes")
-    
     # Special mode uses a counter initially set to 0x0100
     # This is tracked in $EE in the assembly
-    special_counter = 0x100 if special_mode else None
-    
-    bit_count = 8
-    command_byte = 0
+    special_counter = 0x100
 
-    # Main decompression loop
-    while len(output) < data_size and pos < len(compressed_data):
+    # Unread command bits, with a 1 bit above them as an end marker. Once
+    # only the marker is left the next command byte is loaded.
+    command_bits = 1
+
+    while out_len < data_size and pos < data_len:
         # Check special mode counter
         if special_mode and special_counter <= 0:
-            print(f"Special mode counter reached 0, terminating early at {len(output)} bytes")
+            _record_diagnostic(diagnostics, STATUS_SPECIAL_END, pos, out_len, 0)
             break
-            
+
         # Get next command bit
-        if bit_count == 8:
-            bit_count = 0
-            command_byte = compressed_data[pos]
+        if command_bits == 1:
+            command_bits = buf[pos] | 0x100
             pos += 1
 
-        bit_count += 1
-        command_bit = command_byte & 1
-        command_byte >>= 1
-
-        if command_bit:
-            # Copy literal byte
-            if pos >= len(compressed_data):
-                print(f"Error: Reached end of input data at position {pos}")
+        if command_bits & 1:
+            # Copy literal bytes
+            if pos >= data_len:
+                _record_diagnostic(diagnostics, STATUS_EOF_LITERAL, pos, out_len, 0)
                 break
 
-            output.append(compressed_data[pos])
-            pos += 1
-            
+            # The trailing 1 bits of command_bits are a run of literals that
+            # can be copied in one go
+            run = _LITERAL_RUN[command_bits]
+
+            # Stop the run where copying one literal at a time would stop
+            if out_len + run > data_size or pos + run > data_len or special_mode and run > special_counter:
+                run = min(run, data_size - out_len, data_len - pos)
+                if special_mode:
+                    run = min(run, special_counter)
+
+            if run == 1:
+                out[out_len] = buf[pos]
+            else:
+                out[out_len:out_len + run] = buf[pos:pos + run]
+            out_len += run
+            pos += run
+            command_bits >>= run
+
             # Decrement special counter if in special mode
             if special_mode:
-                special_counter -= 1
+                special_counter -= run
         else:
+            command_bits >>= 1
+
             # Read match info (16-bit)
-            if pos + 1 >= len(compressed_data):
-                print(f"Error: Not enough data for match info at position {pos}")
+            if pos + 1 >= data_len:
+                _record_diagnostic(diagnostics, STATUS_EOF_MATCH, pos, out_len, 0)
                 break
 
-            match_info = compressed_data[pos] + (compressed_data[pos+1] << 8)
+            match_info = _U16LE(buf, pos)[0]
             pos += 2
 
             # Extract offset and length
@@ -86,49 +151,299 @@ def decompress_evo_data(compressed_data, start_offset=0, special_mode=False):
             # Calculate total length
             copy_length = length_field + ec_value
 
-            # Handle extended length
-            if length_field == 0x0F and special_flag:
-                if pos >= len(compressed_data):
-                    print(f"Error: Not enough data for extended length at position {pos}")
+            # Handle extended length. special_flag is tested first so data
+            # without the flag skips the compare
+            if special_flag and length_field == 0x0F:
+                if pos >= data_len:
+                    _record_diagnostic(diagnostics, STATUS_EOF_EXTLEN, pos, out_len, 0)
                     break
 
-                extra_length = compressed_data[pos]
+                copy_length += buf[pos]
                 pos += 1
-                copy_length += extra_length
-
-            # Error checks
-            if offset > len(output):
-                print(f"Error: Invalid offset {offset} at position {pos-2} (output size: {len(output)})")
-                # Try to recover by skipping this command
-                continue
-                
-            if copy_length > 0x2000:  # Reasonable upper limit for copy length
-                print(f"Warning: Suspiciously large copy_length: {copy_length}, limiting to 0x2000")
-                copy_length = 0x2000
-                
-            # Check if copy would exceed data_size
-            if len(output) + copy_length > data_size:
-                print(f"Warning: Copy would exceed expected data size. Limiting copy.")
-                copy_length = data_size - len(output)
-
-            # Ensure we have valid output bytes to copy from
-            if len(output) == 0:
-                print(f"Error: Cannot copy from empty output buffer")
-                break
 
-            # Copy bytes from earlier in the output
-            for i in range(copy_length):
-                output.append(output[len(output) - offset])
-                
+            src = out_len - offset
+            if src >= 0 and copy_length <= offset and out_len + copy_length <= data_size:
+                # Fast path for the common case: a match that is valid, fits
+                # in the output and does not overlap what it copies, so none
+                # of the checks below can trigger
+                out[out_len:out_len + copy_length] = out[src:src + copy_length]
+                out_len += copy_length
+            else:
+                # Error checks
+                if offset > out_len:
+                    # Try to recover by skipping this command
+                    _record_diagnostic(diagnostics, STATUS_BAD_OFFSET, pos - 2, out_len, offset)
+                    continue
+
+                if copy_length > 0x2000:  # Reasonable upper limit for copy length
+                    _record_diagnostic(diagnostics, STATUS_LONG_COPY, pos, out_len, copy_length)
+                    copy_length = 0x2000
+
+                # Check if copy would exceed data_size
+                if out_len + copy_length > data_size:
+                    _record_diagnostic(diagnostics, STATUS_OVERRUN, pos, out_len, copy_length)
+                    copy_length = data_size - out_len
+
+                # Ensure we have valid output bytes to copy from
+                if out_len == 0:
+                    _record_diagnostic(diagnostics, STATUS_EMPTY_OUTPUT, pos, out_len, 0)
+                    break
+
+                # Copy bytes from earlier in the output
+                if offset == 1:
+                    # Run of the last byte
+                    out[out_len:out_len + copy_length] = bytes((out[src],)) * copy_length
+                    out_len += copy_length
+                elif offset == 2:
+                    # Run of the last two bytes
+                    pattern = bytes(out[src:out_len])
+                    out[out_len:out_len + copy_length] = (pattern * ((copy_length + 1) // 2))[:copy_length]
+                    out_len += copy_length
+                elif offset >= copy_length:
+                    out[out_len:out_len + copy_length] = out[src:src + copy_length]
+                    out_len += copy_length
+                else:
+                    # Source and destination overlap, so the copy repeats the last
+                    # offset bytes. Copy that pattern in chunks that double in size
+                    # each time, none of which overlap what they are copied from.
+                    remaining = copy_length
+                    off = offset
+                    while off <= remaining:
+                        out[out_len:out_len + off] = out[src:src + off]
+                        out_len += off
+                        remaining -= off
+                        off <<= 1
+                    out[out_len:out_len + remaining] = out[src:src + remaining]
+                    out_len += remaining
+
             # Decrement special counter if in special mode
             if special_mode:
                 special_counter -= 1
 
+    return out, out_len, diagnostics
+
+if njit is not None:
+    # Pinning the signature compiles the cores at import time, and cache=True
+    # stores the result in __pycache__ so later runs skip compiling entirely.
+    # Everything the cores return is a plain array or integer, so the wrapper
+    # needs no compiling either; the only first call cost left is Numba
+    # importing numpy.ma while it types the arguments.
+    # The input is read only since it is usually a view of the ROM bytes.
+    _CORE_SIGNATURE = types.Tuple((types.uint8[::1], types.int64, types.int64[:, ::1]))(
+        types.Array(types.uint8, 1, "C", readonly=True), types.uint8[::1],
+        types.int64, types.int64, types.int64)
+
+    _record_diagnostic_jit = njit(
+        types.void(types.int64[:, ::1], types.int64, types.int64, types.int64, types.int64),
+        cache=True, nogil=True)(_record_diagnostic)
+
+    def _make_decompress_core_jit(special_mode, special_flag):
+        """
+        Build a Numba version of _decompress_core with special_mode and
+        special_flag fixed. Numba treats both as constants here, so the
+        standard mode versions have no special mode counter checks compiled
+        in at all, and the versions without the flag have no extended
+        length branch.
+        """
+
+        @njit(_CORE_SIGNATURE, cache=True, nogil=True)
+        def core(buf, out, start, ec_value, data_size):
+            """
+            Numba version of _decompress_core, works on uint8 arrays
+
+            Args:
+                buf: uint8 array containing compressed data
+                out: Preallocated uint8 array of data_size elements
+                start: Position of the first command byte in buf
+                ec_value: Control byte value with the special flag bit cleared
+                data_size: Expected size of the decompressed data
+
+            Returns:
+                A tuple of (out, out_len, diagnostics)
+            """
+            pos = start
+            out_len = 0
+            data_len = len(buf)
+            diagnostics = np.zeros((_DIAGNOSTIC_ROWS, 4), dtype=np.int64)
+
+            # Special mode uses a counter initially set to 0x0100
+            # This is tracked in $EE in the assembly
+            special_counter = 0x100
+
+            # Unread command bits with an end marker, as in _decompress_core
+            command_bits = 1
+
+            while out_len < data_size and pos < data_len:
+                # Check special mode counter
+                if special_mode and special_counter <= 0:
+                    _record_diagnostic_jit(diagnostics, STATUS_SPECIAL_END, pos, out_len, 0)
+                    break
+
+                # Get next command bit
+                if command_bits == 1:
+                    command_bits = buf[pos] | 0x100
+                    pos += 1
+
+                command_bit = command_bits & 1
+                command_bits >>= 1
+
+                if command_bit:
+                    # Copy literal byte
+                    if pos >= data_len:
+                        _record_diagnostic_jit(diagnostics, STATUS_EOF_LITERAL, pos, out_len, 0)
+                        break
+
+                    out[out_len] = buf[pos]
+                    out_len += 1
+                    pos += 1
+
+                    # Decrement special counter if in special mode
+                    if special_mode:
+                        special_counter -= 1
+                else:
+                    # Read match info (16-bit)
+                    if pos + 1 >= data_len:
+                        _record_diagnostic_jit(diagnostics, STATUS_EOF_MATCH, pos, out_len, 0)
+                        break
+
+                    match_info = buf[pos] | (buf[pos+1] << 8)
+                    pos += 2
+
+                    # Extract offset and length
+                    offset = (match_info & 0x0FFF) + 1
+                    length_field = (match_info >> 12) & 0x0F
+
+                    # Calculate total length
+                    copy_length = length_field + ec_value
+
+                    # Handle extended length
+                    if length_field == 0x0F and special_flag:
+                        if pos >= data_len:
+                            _record_diagnostic_jit(diagnostics, STATUS_EOF_EXTLEN, pos, out_len, 0)
+                            break
+
+                        copy_length += buf[pos]
+                        pos += 1
+
+                    # Error checks
+                    if offset > out_len:
+                        # Try to recover by skipping this command
+                        _record_diagnostic_jit(diagnostics, STATUS_BAD_OFFSET, pos - 2, out_len, offset)
+                        continue
+
+                    if copy_length > 0x2000:  # Reasonable upper limit for copy length
+                        _record_diagnostic_jit(diagnostics, STATUS_LONG_COPY, pos, out_len, copy_length)
+                        copy_length = 0x2000
+
+                    # Check if copy would exceed data_size
+                    if out_len + copy_length > data_size:
+                        _record_diagnostic_jit(diagnostics, STATUS_OVERRUN, pos, out_len, copy_length)
+                        copy_length = data_size - out_len
+
+                    # Ensure we have valid output bytes to copy from
+                    if out_len == 0:
+                        _record_diagnostic_jit(diagnostics, STATUS_EMPTY_OUTPUT, pos, out_len, 0)
+                        break
+
+                    # Copy bytes from earlier in the output. This compiles to a
+                    # native loop, so the slicing tricks from the Python core
+                    # would only add overhead for the short copies seen here
+                    if offset == 1:
+                        out[out_len:out_len + copy_length] = out[out_len - 1]
+                        out_len += copy_length
+                    else:
+                        for i in range(copy_length):
+                            out[out_len] = out[out_len - offset]
+                            out_len += 1
+
+                    # Decrement special counter if in special mode
+                    if special_mode:
+                        special_counter -= 1
+
+            return out, out_len, diagnostics
+
+        return core
+
+    # Compiled cores by (special_mode, special_flag)
+    _DECOMPRESS_CORES_JIT = {
+        (special_mode, special_flag): _make_decompress_core_jit(special_mode, special_flag)
+        for special_mode in (False, True) for special_flag in (False, True)
+    }
+
+def _report_diagnostics(diagnostics, log=print):
+    """
+    Log a summary of the diagnostics recorded by the decompression core,
+    one line per kind of problem
+    """
+    for status in range(1, _DIAGNOSTIC_ROWS):
+        count, pos, out_len, value = diagnostics[status]
+        if count == 0:
+            continue
+
+        message = _STATUS_MESSAGES[status].format(pos=pos, out_len=out_len, value=value)
+        if count > 1:
+            message += f" (and {count - 1} more)"
+        log(message)
+
+def decompress_evo_data(compressed_data, start_offset=0, special_mode=False, log=print):
+    """
+    Decompress E.V.O.: Search for Eden compressed data
+
+    Args:
+        compressed_data: Bytes-like object (bytes, mmap, ...) containing
+            compressed data, or a uint8 array view of it when the compiled
+            core is available
+        start_offset: Starting offset in the compressed data
+        special_mode: Whether to use special mode decompression (jump target 5)
+        log: Function called with each diagnostic message (default: print)
+
+    Returns:
+        Bytes object containing decompressed data
+    """
+    pos = start_offset
+
+    # Read first control byte
+    ec_value = int(compressed_data[pos])
+    pos += 1
+
+    # Check for special flag in control byte
+    special_flag = False
+    if ec_value & 0x80:
+        ec_value &= 0x7F
+        special_flag = True
+
+    # Read data size (16-bit)
+    data_size = _U16LE(compressed_data, pos)[0]
+    pos += 2
+
+    log(f"Control byte: {ec_value:02X}")
+    log(f"Special flag: {special_flag}")
+    log(f"Data size: {data_size} bytes")
+
+    # Main decompression loop
+    if njit is not None:
+        if isinstance(compressed_data, np.ndarray):
+            buf = compressed_data
+        else:
+            buf = np.frombuffer(compressed_data, dtype=np.uint8)
+        out = np.empty(data_size, dtype=np.uint8)
+        core = _DECOMPRESS_CORES_JIT[special_mode, special_flag]
+        output, out_len, diagnostics = core(buf, out, pos, ec_value, data_size)
+    else:
+        out = bytearray(data_size)
+        core = _decompress_core_c if _decompress_core_c is not None else _decompress_core
+        output, out_len, diagnostics = core(
+            compressed_data, out, pos, special_mode, ec_value, special_flag, data_size)
+
+    _report_diagnostics(diagnostics, log)
+
     # Check if we fully decompressed as expected
-    if len(output) < data_size:
-        print(f"Warning: Incomplete decompression. Expected {data_size} bytes, got {len(output)} bytes.")
-    
-    return output
+    if out_len < data_size:
+        log(f"Warning: Incomplete decompression. Expected {data_size} bytes, got {out_len} bytes.")
+
+    # Trim the preallocated buffer through a memoryview so the result is
+    # copied once instead of slicing into a temporary first
+    return bytes(memoryview(output)[:out_len])
 
 def detect_decompress_parameters(compressed_data, start_offset=0):
     """
@@ -149,7 +464,7 @@ def detect_decompress_parameters(compressed_data, start_offset=0):
     special_flag = (control_byte & 0x80) > 0
     
     # Read data size
-    data_size = compressed_data[start_offset+1] + (compressed_data[start_offset+2] << 8)
+    data_size = _U16LE(compressed_data, start_offset+1)[0]
     
     # Heuristic: special mode often has a specific pattern
     # If control byte is 0x01 and data_size is divisible by 0x100, it's likely special mode
@@ -164,48 +479,119 @@ def detect_decompress_parameters(compressed_data, start_offset=0):
     
     return is_special_mode, control_byte, data_size
 
+# Printable ASCII maps to itself, everything else to "."
+_ASCII_TABLE = bytes(b if 32 <= b <= 126 else 0x2E for b in range(256))
+
 def dump_hex(data, bytes_per_line=16):
     """
     Return a nicely formatted hex dump of the data
     """
     result = []
     for i in range(0, len(data), bytes_per_line):
-        chunk = data[i:i+bytes_per_line]
-        hex_part = " ".join(f"{b:02X}" for b in chunk)
-        ascii_part = "".join(chr(b) if 32 <= b <= 126 else "." for b in chunk)
+        chunk = bytes(data[i:i+bytes_per_line])
+        hex_part = chunk.hex(" ").upper()
+        ascii_part = chunk.translate(_ASCII_TABLE).decode("ascii")
         result.append(f"{i:08X}:  {hex_part:<{bytes_per_line*3}}  {ascii_part}")
     return "\n".join(result)
 
-def main():
-    # Check if offset is provided as command-line argument
-    if len(sys.argv) < 2:
-        print("Usage: python script.py <offset> [rom_file] [--special]")
-        print("Offset can be decimal or hex (with 0x prefix)")
-        print("Default ROM file is 'evo.sfc' if not specified")
-        print("Add --special to force special mode decompression")
-        sys.exit(1)
-
-    # Parse the offset
+def parse_offsets(offsets_str):
+    """
+    Parse a comma separated list of decimal or hex (0x prefixed) offsets
+    """
     try:
-        offset_str = sys.argv[1]
-        if offset_str.startswith('0x') or offset_str.startswith('0X'):
-            decompression_offset = int(offset_str, 16)
-        else:
-            decompression_offset = int(offset_str)
+        return [int(offset_str, 16) if offset_str[:2] in ("0x", "0X") else int(offset_str, 10)
+                for offset_str in offsets_str.split(",")]
     except ValueError:
-        print("Error: Invalid offset value. Please provide a valid decimal or hex number.")
-        sys.exit(1)
+        raise argparse.ArgumentTypeError("invalid offset value, please provide valid decimal or hex numbers")
 
-    # Get ROM file from argument or use default
-    rom_file = "evo.sfc"
-    special_mode = False
-    
-    # Process remaining arguments
-    for arg in sys.argv[2:]:
-        if arg == "--special":
-            special_mode = True
-        elif not arg.startswith("--"):
-            rom_file = arg
+def save_decompressed(decompressed_data, offset, special_mode):
+    """
+    Write decompressed data to a file named after its offset and mode
+
+    Returns:
+        Name of the written file
+    """
+    mode_str = "_special" if special_mode else ""
+    output_file = f"{offset:x}{mode_str}.bin"
+    with open(output_file, "wb") as f:
+        f.write(decompressed_data)
+    return output_file
+
+def map_rom(rom_file):
+    """
+    Memory-map a ROM file read only, so it is not copied into memory and
+    can be indexed and sliced like a bytes object
+    """
+    with open(rom_file, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+# ROM data of the workers, set once per worker by _init_worker so it is not
+# sent along with every offset
+_worker_rom = None
+
+def _init_worker(rom):
+    """
+    Set the ROM for a worker. Worker processes get the file name and map
+    the ROM themselves, since an mmap can't be sent to another process.
+    """
+    global _worker_rom
+    if isinstance(rom, str):
+        rom = map_rom(rom)
+    _worker_rom = np.frombuffer(rom, dtype=np.uint8) if njit is not None else rom
+
+def _decompress_job(offset, special_mode):
+    """
+    Decompress one offset in a worker. The messages are collected instead of
+    printed so the logs of all offsets can be shown in order.
+    """
+    messages = []
+    try:
+        decompressed_data = decompress_evo_data(_worker_rom, offset, special_mode, log=messages.append)
+    except Exception as e:
+        messages.append(f"Error during decompression: {e}")
+        decompressed_data = None
+    return decompressed_data, "\n".join(messages)
+
+def decompress_many(rom_file, offsets, special_modes, max_workers=None):
+    """
+    Decompress several offsets of a ROM in parallel, using one worker per
+    CPU core by default. The Numba core releases the GIL, so with Numba the
+    workers are threads sharing one mapping of the ROM, otherwise they are
+    processes that each map it.
+
+    Args:
+        rom_file: Path of the ROM file
+        offsets: Offsets of the compressed data
+        special_modes: Whether to use special mode for each offset
+        max_workers: Number of workers (default: os.cpu_count())
+
+    Returns:
+        A list of (decompressed data or None on error, log text) tuples,
+        in the same order as offsets
+    """
+    if njit is not None:
+        executor_class, rom = ThreadPoolExecutor, map_rom(rom_file)
+    else:
+        executor_class, rom = ProcessPoolExecutor, rom_file
+    with executor_class(max_workers=max_workers or os.cpu_count(),
+                        initializer=_init_worker, initargs=(rom,)) as executor:
+        return list(executor.map(_decompress_job, offsets, special_modes))
+
+def main():
+    parser = argparse.ArgumentParser(description="Decompress E.V.O.: Search for Eden compressed data")
+    parser.add_argument("offset", type=parse_offsets,
+                        help="Offset can be decimal or hex (with 0x prefix). "
+                             "Several offsets separated by commas are decompressed in parallel")
+    parser.add_argument("rom_file", nargs="?", default="evo.sfc",
+                        help="Default ROM file is 'evo.sfc' if not specified")
+    parser.add_argument("--special", action="store_true",
+                        help="Force special mode decompression")
+    # Intermixed parsing lets --special sit between offset and rom_file
+    args = parser.parse_intermixed_args()
+
+    decompression_offsets = args.offset
+    rom_file = args.rom_file
+    special_mode = args.special
 
     # Check if the ROM file exists
     if not os.path.exists(rom_file):
@@ -214,18 +600,46 @@ def main():
 
     # Load the ROM file
     try:
-        with open(rom_file, "rb") as f:
-            rom_data = f.read()
+        rom_data = map_rom(rom_file)
     except Exception as e:
         print(f"Error loading ROM file: {e}")
         sys.exit(1)
 
-    # Make sure the offset is valid
-    if decompression_offset >= len(rom_data):
-        print(f"Error: Offset 0x{decompression_offset:X} is beyond the size of the ROM ({len(rom_data)} bytes).")
-        sys.exit(1)
+    # Make sure the offsets are valid
+    for decompression_offset in decompression_offsets:
+        if decompression_offset >= len(rom_data):
+            print(f"Error: Offset 0x{decompression_offset:X} is beyond the size of the ROM ({len(rom_data)} bytes).")
+            sys.exit(1)
 
     print(f"ROM size: {len(rom_data)} bytes")
+
+    if len(decompression_offsets) > 1:
+        # Auto-detect parameters for each offset if not forced
+        special_modes = []
+        for decompression_offset in decompression_offsets:
+            detected_special = detect_decompress_parameters(rom_data, decompression_offset)[0]
+            special_modes.append(special_mode or detected_special)
+
+        print(f"Decompressing {len(decompression_offsets)} offsets in parallel")
+        results = decompress_many(rom_file, decompression_offsets, special_modes)
+
+        for decompression_offset, offset_special, (decompressed_data, log) in zip(
+                decompression_offsets, special_modes, results):
+            print(f"\nOffset 0x{decompression_offset:X} ({'special' if offset_special else 'standard'} mode):")
+            print(log)
+            if decompressed_data is not None:
+                output_file = save_decompressed(decompressed_data, decompression_offset, offset_special)
+                print(f"Decompressed {len(decompressed_data)} bytes to: {output_file}")
+        return
+
+    decompression_offset = decompression_offsets[0]
+
+    # The compiled core reads the ROM through a uint8 array, make the view once
+    if njit is not None:
+        rom_buf = np.frombuffer(rom_data, dtype=np.uint8)
+    else:
+        rom_buf = rom_data
+
     print(f"Attempting to decompress data at offset: 0x{decompression_offset:X}")
 
     # Auto-detect parameters if not forced
@@ -239,13 +653,10 @@ def main():
 
     # Decompress the data
     try:
-        decompressed_data = decompress_evo_data(rom_data, decompression_offset, special_mode)
+        decompressed_data = decompress_evo_data(rom_buf, decompression_offset, special_mode)
 
         # Write the decompressed data to a file (using offset and mode in filename)
-        mode_str = "_special" if special_mode else ""
-        output_file = f"{decompression_offset:x}{mode_str}.bin"
-        with open(output_file, "wb") as f:
-            f.write(decompressed_data)
+        output_file = save_decompressed(decompressed_data, decompression_offset, special_mode)
 
         print(f"\nSuccessfully decompressed {len(decompressed_data)} bytes.")
         print(f"Decompressed data saved to: {output_file}")